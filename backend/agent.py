@@ -9,7 +9,8 @@ from livekit.agents import (
 from livekit.agents.multimodal import MultimodalAgent
 from livekit.plugins import openai
 from dotenv import load_dotenv
-from api import AssistantFnc, DB  # Import DB from api where it's already instantiated
+from api import AssistantFnc, ASYNC_DB, index_lesson_plan  # Import the async DB wrapper from api where it's already instantiated
+from utils.lesson_chunks import build_outline
 from prompts import WELCOME_MESSAGE, INSTRUCTIONS, LOOKUP_VIN_MESSAGE
 import os
 
@@ -21,14 +22,21 @@ async def entrypoint(ctx: JobContext):
     await ctx.wait_for_participant()
     
     # Get active lesson plan content
-    active_plan = DB.get_active_lesson_plan()
-    lesson_content = active_plan['content'] if active_plan else "No lesson plan selected"
+    active_plan = await ASYNC_DB.get_active_lesson_plan()
+    if not active_plan:
+        lesson_content = "No lesson plan selected"
+    elif not active_plan['content']:
+        lesson_content = "The selected lesson plan has no extracted text yet"
+    else:
+        # The model gets an outline and searches the indexed plan for details
+        await index_lesson_plan(active_plan)
+        lesson_content = build_outline(active_plan['content'])
     
     # Log the first 50 characters of the lesson content
     preview = lesson_content[:50] + "..." if len(lesson_content) > 50 else lesson_content
-    print(f"Loading agent with lesson content: {preview}")
+    print(f"Loading agent with lesson outline: {preview}")
     
-    # Format instructions with lesson plan content
+    # Format instructions with lesson plan outline
     formatted_instructions = INSTRUCTIONS.format(lesson_plan=lesson_content)
     
     model = openai.realtime.RealtimeModel(
@@ -37,7 +45,7 @@ async def entrypoint(ctx: JobContext):
         temperature=0.8,
         modalities=["audio", "text"]
     )
-    assistant_fnc = AssistantFnc()
+    assistant_fnc = AssistantFnc(lesson_plan_id=active_plan['id'] if active_plan else None)
     assistant = MultimodalAgent(model=model, fnc_ctx=assistant_fnc)
     assistant.start(ctx.room)
     
@@ -1,13 +1,21 @@
 from livekit.agents import llm
+import asyncio
 import enum
-from typing import Annotated
+from typing import Annotated, Optional
 import logging
 from db_driver import DatabaseDriver
+from async_db_driver import AsyncDatabaseDriver
+from utils.lesson_chunks import chunk_text, search_keywords
 
 logger = logging.getLogger("user-data")
 logger.setLevel(logging.INFO)
 
 DB = DatabaseDriver()
+# Tool calls run on the agent's event loop, so they go through the async wrapper
+ASYNC_DB = AsyncDatabaseDriver(DB)
+
+# Number of lesson plan chunks returned to the model per search
+LESSON_SEARCH_TOP_K = 3
 
 class CarDetails(enum.Enum):
     VIN = "vin"
@@ -17,8 +25,10 @@ class CarDetails(enum.Enum):
     
 
 class AssistantFnc(llm.FunctionContext):
-    def __init__(self):
+    def __init__(self, lesson_plan_id: Optional[int] = None):
         super().__init__()
+        # The active lesson plan, searched by search_lesson_plan instead of being inlined into the prompt
+        self._lesson_plan_id = lesson_plan_id
         #add some context to the this class so that the llm has some specific information to work with,
         #for example, the car details that are the subject of the conversation.
         self._car_details = {
@@ -36,10 +46,10 @@ class AssistantFnc(llm.FunctionContext):
         return car_str
     
     @llm.ai_callable(description="lookup a car by its vin")
-    def lookup_car(self, vin: Annotated[str, llm.TypeInfo(description="The vin of the car to lookup")]):
+    async def lookup_car(self, vin: Annotated[str, llm.TypeInfo(description="The vin of the car to lookup")]):
         logger.info("lookup car - vin: %s", vin)
         
-        result = DB.get_car_by_vin(vin)
+        result = await ASYNC_DB.get_car_by_vin(vin)
         if result is None:
             return "Car not found"
         
@@ -58,7 +68,7 @@ class AssistantFnc(llm.FunctionContext):
         return f"The car details are: {self.get_car_str()}"
     
     @llm.ai_callable(description="create a new car")
-    def create_car(
+    async def create_car(
         self, 
         vin: Annotated[str, llm.TypeInfo(description="The vin of the car")],
         make: Annotated[str, llm.TypeInfo(description="The make of the car ")],
@@ -66,7 +76,7 @@ class AssistantFnc(llm.FunctionContext):
         year: Annotated[int, llm.TypeInfo(description="The year of the car")]
     ):
         logger.info("create car - vin: %s, make: %s, model: %s, year: %s", vin, make, model, year)
-        result = DB.create_car(vin, make, model, year)
+        result = await ASYNC_DB.create_car(vin, make, model, year)
         if result is None:
             return "Failed to create car"
         
@@ -78,5 +88,25 @@ class AssistantFnc(llm.FunctionContext):
         }
         
         return "car created!"
-    
-   
\ No newline at end of file
+
+    @llm.ai_callable(description="search the active lesson plan for the passages relevant to a question")
+    async def search_lesson_plan(
+        self,
+        query: Annotated[str, llm.TypeInfo(description="Keywords or a question about the lesson plan")]
+    ):
+        logger.info("search lesson plan - query: %s", query)
+        if self._lesson_plan_id is None:
+            return "No lesson plan is selected"
+        
+        chunks = await ASYNC_DB.search_lesson_plan_chunks(self._lesson_plan_id, search_keywords(query), LESSON_SEARCH_TOP_K)
+        if not chunks:
+            return "Nothing in the lesson plan matches that query"
+        
+        return "Relevant lesson plan passages:\n\n" + "\n---\n".join(chunks)
+
+
+async def index_lesson_plan(plan: dict) -> None:
+    """Chunk and index a plan's text for search_lesson_plan, unless it is already indexed"""
+    if plan.get('content') and not await ASYNC_DB.has_lesson_plan_chunks(plan['id']):
+        chunks = await asyncio.to_thread(chunk_text, plan['content'])
+        await ASYNC_DB.save_lesson_plan_chunks(plan['id'], chunks)
@@ -0,0 +1,51 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+from db_driver import DatabaseDriver, Car
+
+class AsyncDatabaseDriver:
+    """
+    Awaitable wrapper around DatabaseDriver for code running on an asyncio event loop.
+
+    Reads run on a small thread pool. Writes go through a single writer thread so
+    they are applied in order and never wait on each other for the SQLite write
+    lock. Either way a slow disk or lock wait only blocks a worker thread, not the
+    event loop that is handling audio.
+    """
+
+    def __init__(self, driver: DatabaseDriver, max_readers: int = 4):
+        self.driver = driver
+        self._readers = ThreadPoolExecutor(max_workers=max_readers, thread_name_prefix="db-read")
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="db-write")
+
+    async def _read(self, fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._readers, fn, *args)
+
+    async def _write(self, fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._writer, fn, *args)
+
+    async def get_car_by_vin(self, vin: str) -> Optional[Car]:
+        return await self._read(self.driver.get_car_by_vin, vin)
+
+    async def create_car(self, vin: str, make: str, model: str, year: int) -> Car:
+        return await self._write(self.driver.create_car, vin, make, model, year)
+
+    async def get_lesson_plan(self, plan_id: int) -> Optional[dict]:
+        return await self._read(self.driver.get_lesson_plan, plan_id)
+
+    async def get_active_lesson_plan(self) -> Optional[dict]:
+        return await self._read(self.driver.get_active_lesson_plan)
+
+    async def has_lesson_plan_chunks(self, plan_id: int) -> bool:
+        return await self._read(self.driver.has_lesson_plan_chunks, plan_id)
+
+    async def save_lesson_plan_chunks(self, plan_id: int, chunks: list[str]) -> None:
+        return await self._write(self.driver.save_lesson_plan_chunks, plan_id, chunks)
+
+    async def search_lesson_plan_chunks(self, plan_id: int, query: str, limit: int = 3) -> list[str]:
+        return await self._read(self.driver.search_lesson_plan_chunks, plan_id, query, limit)
+
+    def close(self) -> None:
+        self._readers.shutdown(wait=True)
+        self._writer.shutdown(wait=True)
+        self.driver.close()
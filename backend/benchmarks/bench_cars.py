@@ -0,0 +1,62 @@
+"""
+Throughput of single-row create_car against bulk import_cars, and of repeated
+VIN lookups with and without the car cache.
+
+Usage:
+    python benchmarks/bench_cars.py --cars 5000 --lookups 20000
+"""
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from db_driver import DatabaseDriver
+
+
+def fleet(count: int):
+    return [(f"VIN{i:08d}", "Ford", "Transit", 2015 + i % 10) for i in range(count)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cars", type=int, default=5000)
+    parser.add_argument("--lookups", type=int, default=20000)
+    args = parser.parse_args()
+    cars = fleet(args.cars)
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        db = DatabaseDriver(db_path=os.path.join(tmp, "single.sqlite"))
+        start = time.perf_counter()
+        for car in cars:
+            db.create_car(*car)
+        single = time.perf_counter() - start
+        db.close()
+        
+        db = DatabaseDriver(db_path=os.path.join(tmp, "bulk.sqlite"))
+        start = time.perf_counter()
+        db.import_cars(cars)
+        bulk = time.perf_counter() - start
+        
+        print(f"create_car:  {args.cars / single:>12,.0f} cars/s")
+        print(f"import_cars: {args.cars / bulk:>12,.0f} cars/s  ({single / bulk:.1f}x)")
+        
+        # The voice agent keeps asking about a handful of VINs
+        rng = random.Random(0)
+        vins = [rng.choice(cars[:50])[0] for _ in range(args.lookups)]
+        for label, cache_size in (("uncached", 0), ("cached", 1024)):
+            lookup_db = DatabaseDriver(db_path=os.path.join(tmp, "bulk.sqlite"), car_cache_size=cache_size)
+            start = time.perf_counter()
+            for vin in vins:
+                lookup_db.get_car_by_vin(vin)
+            elapsed = time.perf_counter() - start
+            lookup_db.close()
+            print(f"{label} lookups: {args.lookups / elapsed:>12,.0f} lookups/s")
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
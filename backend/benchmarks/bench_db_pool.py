@@ -0,0 +1,53 @@
+"""
+Compare per-call SQLite connections against the pooled WAL mode of DatabaseDriver.
+
+Usage:
+    python benchmarks/bench_db_pool.py --ops 2000 --threads 8
+"""
+import os
+import sys
+import time
+import argparse
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from db_driver import DatabaseDriver
+
+
+def run_workload(db: DatabaseDriver, ops: int, threads: int) -> float:
+    """Mixed read/write workload: one insert for every four VIN lookups"""
+    def worker(worker_id: int):
+        for i in range(ops // threads):
+            if i % 5 == 0:
+                db.create_car(f"VIN-{worker_id}-{i}", "Ford", "Focus", 2020)
+            else:
+                db.get_car_by_vin(f"VIN-{worker_id}-{i - i % 5}")
+    
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        list(executor.map(worker, range(threads)))
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--ops", type=int, default=2000)
+    parser.add_argument("--threads", type=int, default=8)
+    args = parser.parse_args()
+    
+    results = {}
+    for label, pool_size in (("per-call", 0), ("pooled", args.threads)):
+        with tempfile.TemporaryDirectory() as tmp:
+            db = DatabaseDriver(db_path=os.path.join(tmp, "bench.sqlite"), pool_size=pool_size)
+            elapsed = run_workload(db, args.ops, args.threads)
+            db.close()
+        results[label] = elapsed
+        print(f"{label:>9}: {elapsed:.3f}s  ({args.ops / elapsed:,.0f} ops/s)")
+    
+    print(f"speedup: {results['per-call'] / results['pooled']:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
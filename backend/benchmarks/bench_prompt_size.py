@@ -0,0 +1,66 @@
+"""
+Compare the system prompt size with the whole lesson plan inlined against the
+outline + search_lesson_plan retrieval approach, for plans of increasing size.
+
+Usage:
+    python benchmarks/bench_prompt_size.py --pages 1 5 10 40
+"""
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from db_driver import DatabaseDriver
+from prompts import INSTRUCTIONS
+from benchmarks.pdf_corpus import WORDS
+from utils.lesson_chunks import chunk_text, build_outline, search_keywords
+
+# Rough rule of thumb for English text
+CHARS_PER_TOKEN = 4
+
+
+def make_plan(pages: int, seed: int = 0) -> str:
+    """Synthetic lesson plan text with a heading and a few paragraphs per page"""
+    rng = random.Random(seed)
+    sections = []
+    for page in range(pages):
+        sections.append(f"Section {page + 1}: {rng.choice(WORDS).title()} {rng.choice(WORDS)}")
+        for _ in range(4):
+            sections.append(" ".join(rng.choice(WORDS) for _ in range(120)) + ".")
+    return "\n\n".join(sections)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, nargs="+", default=[1, 5, 10, 40])
+    parser.add_argument("--top-k", type=int, default=3)
+    args = parser.parse_args()
+    
+    print(f"{'pages':>6} {'inline tok':>11} {'outline tok':>12} {'tool result tok':>16} {'search ms':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        db = DatabaseDriver(db_path=os.path.join(tmp, "bench.sqlite"))
+        for pages in args.pages:
+            plan = make_plan(pages)
+            plan_id = db.save_lesson_plan(f"{pages}.pdf", f"{pages}.pdf", len(plan), plan)
+            db.save_lesson_plan_chunks(plan_id, chunk_text(plan))
+            
+            inline_prompt = INSTRUCTIONS.format(lesson_plan=plan)
+            outline_prompt = INSTRUCTIONS.format(lesson_plan=build_outline(plan))
+            
+            start = time.perf_counter()
+            chunks = db.search_lesson_plan_chunks(plan_id, search_keywords("what homework is set for the group discussion?"), args.top_k)
+            search_ms = (time.perf_counter() - start) * 1000
+            tool_result = "\n---\n".join(chunks)
+            
+            print(f"{pages:>6} {len(inline_prompt) // CHARS_PER_TOKEN:>11,} "
+                  f"{len(outline_prompt) // CHARS_PER_TOKEN:>12,} "
+                  f"{len(tool_result) // CHARS_PER_TOKEN:>16,} {search_ms:>10.2f}")
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
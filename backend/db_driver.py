@@ -1,36 +1,192 @@
 import sqlite3
-from typing import Optional
+import queue
+import time
+import base64
+import itertools
+import threading
+from collections import OrderedDict
+from typing import Iterable, Optional
 from dataclasses import dataclass
 from contextlib import contextmanager
 from datetime import datetime
 import os
 
-@dataclass
+# Connection tuning, overridable from the environment. A pool size of 0 keeps
+# the original behaviour of opening and closing a connection on every call.
+DEFAULT_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', '4'))
+DEFAULT_CACHE_SIZE_KB = int(os.getenv('DB_CACHE_SIZE_KB', '8192'))
+DEFAULT_MMAP_SIZE = int(os.getenv('DB_MMAP_SIZE', str(64 * 1024 * 1024)))
+DEFAULT_SYNCHRONOUS = os.getenv('DB_SYNCHRONOUS', 'NORMAL')
+DEFAULT_BUSY_TIMEOUT_MS = int(os.getenv('DB_BUSY_TIMEOUT_MS', '5000'))
+STATEMENT_CACHE_SIZE = 128
+DEFAULT_CAR_CACHE_SIZE = int(os.getenv('DB_CAR_CACHE_SIZE', '1024'))
+DEFAULT_CAR_CACHE_TTL = float(os.getenv('DB_CAR_CACHE_TTL', '300'))
+IMPORT_BATCH_SIZE = 1000
+
+@dataclass(frozen=True)
 class Car:
+    __slots__ = ('vin', 'make', 'model', 'year')
     vin: str
     make: str
     model: str
     year: int
 
+class CarCache:
+    """
+    Bounded LRU cache of cars by VIN. Entries also expire after ttl seconds so
+    cars written by another process (e.g. a bulk import) show up eventually.
+    """
+
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: OrderedDict[str, tuple[float, Car]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, vin: str) -> Optional[Car]:
+        with self._lock:
+            entry = self._entries.get(vin)
+            if entry is None:
+                return None
+            expires_at, car = entry
+            if expires_at < time.monotonic():
+                del self._entries[vin]
+                return None
+            self._entries.move_to_end(vin)
+            return car
+
+    def put(self, car: Car) -> None:
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[car.vin] = (time.monotonic() + self.ttl, car)
+            self._entries.move_to_end(car.vin)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
 class DatabaseDriver:
-    def __init__(self, db_path: str = None):
+    def __init__(
+        self,
+        db_path: str = None,
+        pool_size: int = None,
+        cache_size_kb: int = None,
+        mmap_size: int = None,
+        synchronous: str = None,
+        car_cache_size: int = None,
+        car_cache_ttl: float = None,
+    ):
         # Get the database path from environment or use default
         self.db_path = db_path or os.getenv('DB_PATH', 'auto_db.sqlite')
+        self.pool_size = DEFAULT_POOL_SIZE if pool_size is None else pool_size
+        self.cache_size_kb = DEFAULT_CACHE_SIZE_KB if cache_size_kb is None else cache_size_kb
+        self.mmap_size = DEFAULT_MMAP_SIZE if mmap_size is None else mmap_size
+        self.synchronous = (synchronous or DEFAULT_SYNCHRONOUS).upper()
+        if self.synchronous not in ('OFF', 'NORMAL', 'FULL', 'EXTRA'):
+            raise ValueError(f"Invalid synchronous setting: {self.synchronous}")
         
         # If the path contains directories, create them
         db_dir = os.path.dirname(self.db_path)
         if db_dir:  # Only create directories if there's a path
             os.makedirs(db_dir, exist_ok=True)
         
+        self._car_cache = CarCache(
+            DEFAULT_CAR_CACHE_SIZE if car_cache_size is None else car_cache_size,
+            DEFAULT_CAR_CACHE_TTL if car_cache_ttl is None else car_cache_ttl
+        )
+        
+        # Idle pooled connections; connections are created lazily up to pool_size
+        self._pool = queue.LifoQueue(maxsize=self.pool_size) if self.pool_size > 0 else None
+        self._pool_lock = threading.Lock()
+        self._pool_created = 0
+        
         self._init_db()
 
+    def _connect(self) -> sqlite3.Connection:
+        pooled = self._pool is not None
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=DEFAULT_BUSY_TIMEOUT_MS / 1000,
+            check_same_thread=not pooled,
+            cached_statements=STATEMENT_CACHE_SIZE,
+        )
+        if pooled:
+            # WAL lets readers keep going while a writer commits. The journal mode
+            # is stored in the database file, so every later connection sees it too.
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(f"PRAGMA synchronous={self.synchronous}")
+            conn.execute(f"PRAGMA cache_size=-{int(self.cache_size_kb)}")
+            conn.execute(f"PRAGMA mmap_size={int(self.mmap_size)}")
+            conn.execute("PRAGMA temp_store=MEMORY")
+        return conn
+
+    def _acquire(self) -> sqlite3.Connection:
+        try:
+            return self._pool.get_nowait()
+        except queue.Empty:
+            pass
+        
+        with self._pool_lock:
+            if self._pool_created < self.pool_size:
+                self._pool_created += 1
+                create = True
+            else:
+                create = False
+        
+        if create:
+            try:
+                return self._connect()
+            except Exception:
+                with self._pool_lock:
+                    self._pool_created -= 1
+                raise
+        
+        # Pool exhausted, wait for another caller to hand a connection back
+        return self._pool.get()
+
+    def _release(self, conn: sqlite3.Connection) -> None:
+        # Never hand a connection with an open transaction to the next caller
+        if conn.in_transaction:
+            conn.rollback()
+        self._pool.put_nowait(conn)
+
     @contextmanager
     def _get_connection(self):
-        conn = sqlite3.connect(self.db_path)
+        if self._pool is None:
+            conn = sqlite3.connect(self.db_path)
+            try:
+                yield conn
+            finally:
+                conn.close()
+            return
+        
+        conn = self._acquire()
         try:
             yield conn
         finally:
+            try:
+                self._release(conn)
+            except sqlite3.Error:
+                # The connection is in a bad state, drop it so a fresh one is opened
+                conn.close()
+                with self._pool_lock:
+                    self._pool_created -= 1
+
+    def close(self) -> None:
+        """Close all idle pooled connections"""
+        if self._pool is None:
+            return
+        while True:
+            try:
+                conn = self._pool.get_nowait()
+            except queue.Empty:
+                break
             conn.close()
+            with self._pool_lock:
+                self._pool_created -= 1
 
     def _init_db(self):
         with self._get_connection() as conn:
@@ -55,9 +211,130 @@ class DatabaseDriver:
                     upload_date TIMESTAMP NOT NULL,
                     file_size INTEGER NOT NULL,
                     content TEXT,
-                    is_active INTEGER DEFAULT 0
+                    is_active INTEGER DEFAULT 0,
+                    extraction_status TEXT NOT NULL DEFAULT 'done',
+                    content_hash TEXT
+                )
+            """)
+            
+            # Migrate databases created before background extraction existed
+            columns = {row[1] for row in cursor.execute("PRAGMA table_info(lesson_plans)")}
+            if 'extraction_status' not in columns:
+                cursor.execute("ALTER TABLE lesson_plans ADD COLUMN extraction_status TEXT NOT NULL DEFAULT 'done'")
+            if 'content_hash' not in columns:
+                cursor.execute("ALTER TABLE lesson_plans ADD COLUMN content_hash TEXT")
+            
+            # Uploads are deduplicated by the SHA-256 of the file
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_lesson_plans_content_hash
+                ON lesson_plans (content_hash)
+            """)
+            
+            # Keyset pagination index for the metadata listing
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_lesson_plans_upload_date
+                ON lesson_plans (upload_date DESC, id DESC)
+            """)
+            
+            # Change counters, bumped by triggers so clients can cheaply revalidate
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS change_counters (
+                    name TEXT PRIMARY KEY,
+                    version INTEGER NOT NULL DEFAULT 0
+                )
+            """)
+            cursor.execute(
+                "INSERT OR IGNORE INTO change_counters (name, version) VALUES ('lesson_plans', 0)"
+            )
+            for event in ('INSERT', 'UPDATE', 'DELETE'):
+                cursor.execute(f"""
+                    CREATE TRIGGER IF NOT EXISTS lesson_plans_version_{event.lower()}
+                    AFTER {event} ON lesson_plans
+                    BEGIN
+                        UPDATE change_counters SET version = version + 1 WHERE name = 'lesson_plans';
+                    END
+                """)
+            
+            # Full-text index over plan titles and extracted text. It is an external
+            # content table, so triggers keep it in step with lesson_plans.
+            fts_exists = cursor.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'lesson_plans_fts'"
+            ).fetchone()
+            cursor.execute("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS lesson_plans_fts USING fts5(
+                    title, content, content='lesson_plans', content_rowid='id'
                 )
             """)
+            cursor.execute("""
+                CREATE TRIGGER IF NOT EXISTS lesson_plans_fts_insert AFTER INSERT ON lesson_plans
+                BEGIN
+                    INSERT INTO lesson_plans_fts (rowid, title, content) VALUES (new.id, new.title, new.content);
+                END
+            """)
+            cursor.execute("""
+                CREATE TRIGGER IF NOT EXISTS lesson_plans_fts_delete AFTER DELETE ON lesson_plans
+                BEGIN
+                    INSERT INTO lesson_plans_fts (lesson_plans_fts, rowid, title, content)
+                    VALUES ('delete', old.id, old.title, old.content);
+                END
+            """)
+            # Only reindex when indexed columns change, not on is_active or status updates
+            cursor.execute("""
+                CREATE TRIGGER IF NOT EXISTS lesson_plans_fts_update AFTER UPDATE OF title, content ON lesson_plans
+                BEGIN
+                    INSERT INTO lesson_plans_fts (lesson_plans_fts, rowid, title, content)
+                    VALUES ('delete', old.id, old.title, old.content);
+                    INSERT INTO lesson_plans_fts (rowid, title, content) VALUES (new.id, new.title, new.content);
+                END
+            """)
+            if not fts_exists:
+                # Index plans that were uploaded before the search index existed
+                cursor.execute("INSERT INTO lesson_plans_fts (lesson_plans_fts) VALUES ('rebuild')")
+            
+            # Retrieval chunks of each plan's text for the agent's search tool
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS lesson_plan_chunks (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    plan_id INTEGER NOT NULL,
+                    chunk_index INTEGER NOT NULL,
+                    text TEXT NOT NULL
+                )
+            """)
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_lesson_plan_chunks_plan
+                ON lesson_plan_chunks (plan_id, chunk_index)
+            """)
+            cursor.execute("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS lesson_plan_chunks_fts USING fts5(
+                    text, content='lesson_plan_chunks', content_rowid='id'
+                )
+            """)
+            cursor.execute("""
+                CREATE TRIGGER IF NOT EXISTS lesson_plan_chunks_fts_insert AFTER INSERT ON lesson_plan_chunks
+                BEGIN
+                    INSERT INTO lesson_plan_chunks_fts (rowid, text) VALUES (new.id, new.text);
+                END
+            """)
+            cursor.execute("""
+                CREATE TRIGGER IF NOT EXISTS lesson_plan_chunks_fts_delete AFTER DELETE ON lesson_plan_chunks
+                BEGIN
+                    INSERT INTO lesson_plan_chunks_fts (lesson_plan_chunks_fts, rowid, text)
+                    VALUES ('delete', old.id, old.text);
+                END
+            """)
+            # Chunks are rebuilt on demand, drop them when the plan text changes or the plan goes
+            cursor.execute("""
+                CREATE TRIGGER IF NOT EXISTS lesson_plan_chunks_invalidate AFTER UPDATE OF content ON lesson_plans
+                BEGIN
+                    DELETE FROM lesson_plan_chunks WHERE plan_id = new.id;
+                END
+            """)
+            cursor.execute("""
+                CREATE TRIGGER IF NOT EXISTS lesson_plan_chunks_cascade AFTER DELETE ON lesson_plans
+                BEGIN
+                    DELETE FROM lesson_plan_chunks WHERE plan_id = old.id;
+                END
+            """)
             
             # Create uploads directory if it doesn't exist
             if not os.path.exists('uploads'):
@@ -73,41 +350,122 @@ class DatabaseDriver:
                 (vin, make, model, year)
             )
             conn.commit()
-            return Car(vin=vin, make=make, model=model, year=year)
+            car = Car(vin=vin, make=make, model=model, year=year)
+            self._car_cache.put(car)
+            return car
 
     def get_car_by_vin(self, vin: str) -> Optional[Car]:
+        car = self._car_cache.get(vin)
+        if car is not None:
+            return car
+        
         with self._get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("SELECT * FROM cars WHERE vin = ?", (vin,))
+            cursor.execute("SELECT vin, make, model, year FROM cars WHERE vin = ?", (vin,))
             row = cursor.fetchone()
             if not row:
                 return None
             
-            return Car(
+            car = Car(
                 vin=row[0],
                 make=row[1],
                 model=row[2],
                 year=row[3]
             )
+            self._car_cache.put(car)
+            return car
+
+    def import_cars(self, cars: Iterable[tuple], replace: bool = False) -> int:
+        """
+        Bulk insert (vin, make, model, year) rows in a single transaction.
+        
+        Rows are written in batches with executemany so large imports don't have to
+        be held in memory. Existing VINs are skipped, or overwritten when replace is
+        True. Returns the number of rows written.
+        """
+        verb = "INSERT OR REPLACE" if replace else "INSERT OR IGNORE"
+        written = 0
+        rows = iter(cars)
+        with self._get_connection() as conn:
+            try:
+                while True:
+                    batch = [(vin, make, model, int(year)) for vin, make, model, year in itertools.islice(rows, IMPORT_BATCH_SIZE)]
+                    if not batch:
+                        break
+                    cursor = conn.executemany(
+                        f"{verb} INTO cars (vin, make, model, year) VALUES (?, ?, ?, ?)",
+                        batch
+                    )
+                    written += cursor.rowcount
+                conn.commit()
+            except BaseException:
+                conn.rollback()
+                raise
+        # Imports can overwrite cached cars, start the cache over once the rows are visible
+        self._car_cache.clear()
+        return written
 
-    def save_lesson_plan(self, title: str, file_path: str, file_size: int, content: str = None) -> int:
+    def save_lesson_plan(self, title: str, file_path: str, file_size: int, content: str = None, extraction_status: str = 'done', content_hash: str = None) -> int:
         with self._get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute(
                 """
-                INSERT INTO lesson_plans (title, file_path, upload_date, file_size, content) 
-                VALUES (?, ?, ?, ?, ?)
+                INSERT INTO lesson_plans (title, file_path, upload_date, file_size, content, extraction_status, content_hash) 
+                VALUES (?, ?, ?, ?, ?, ?, ?)
                 """,
-                (title, file_path, datetime.now().isoformat(), file_size, content)
+                (title, file_path, datetime.now().isoformat(), file_size, content, extraction_status, content_hash)
             )
             conn.commit()
             return cursor.lastrowid
 
+    def update_lesson_plan_content(self, plan_id: int, content: Optional[str], extraction_status: str) -> None:
+        """
+        Store the result of a background extraction job.
+        
+        Other plans with the same file that are still waiting on their own
+        extraction get the result as well.
+        """
+        with self._get_connection() as conn:
+            conn.execute(
+                """
+                UPDATE lesson_plans SET content = ?, extraction_status = ?
+                WHERE id = ?
+                   OR (content_hash = (SELECT content_hash FROM lesson_plans WHERE id = ?)
+                       AND extraction_status != 'done')
+                """,
+                (content, extraction_status, plan_id, plan_id)
+            )
+            conn.commit()
+
+    def find_extracted_content(self, content_hash: str) -> Optional[str]:
+        """Extracted text of an earlier upload of the same file, if extraction succeeded"""
+        with self._get_connection() as conn:
+            row = conn.execute(
+                "SELECT content FROM lesson_plans WHERE content_hash = ? AND extraction_status = 'done' LIMIT 1",
+                (content_hash,)
+            ).fetchone()
+            return row[0] if row else None
+
+    def count_plans_with_hash(self, content_hash: str) -> int:
+        with self._get_connection() as conn:
+            return conn.execute(
+                "SELECT COUNT(*) FROM lesson_plans WHERE content_hash = ?",
+                (content_hash,)
+            ).fetchone()[0]
+
+    def set_extraction_status(self, plan_id: int, extraction_status: str) -> None:
+        with self._get_connection() as conn:
+            conn.execute(
+                "UPDATE lesson_plans SET extraction_status = ? WHERE id = ?",
+                (extraction_status, plan_id)
+            )
+            conn.commit()
+
     def get_lesson_plan(self, plan_id: int) -> Optional[dict]:
         with self._get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute(
-                "SELECT id, title, file_path, upload_date, file_size, content FROM lesson_plans WHERE id = ?", 
+                "SELECT id, title, file_path, upload_date, file_size, content, extraction_status, content_hash FROM lesson_plans WHERE id = ?", 
                 (plan_id,)
             )
             row = cursor.fetchone()
@@ -120,7 +478,9 @@ class DatabaseDriver:
                 'file_path': row[2],
                 'upload_date': row[3],
                 'file_size': row[4],
-                'content': row[5]
+                'content': row[5],
+                'extraction_status': row[6],
+                'content_hash': row[7]
             }
 
     def get_all_lesson_plans(self) -> list[dict]:
@@ -140,6 +500,142 @@ class DatabaseDriver:
                 'is_active': bool(row[5])
             } for row in rows]
 
+    def list_lesson_plan_metadata(self, limit: Optional[int] = None, cursor: Optional[str] = None) -> tuple[list[dict], Optional[str]]:
+        """
+        List lesson plans newest first without their extracted content.
+        
+        Pages are keyed on (upload_date, id) so each page is an index range scan
+        regardless of how deep the client has paged. Returns the page and an
+        opaque cursor for the next page, or None when there are no more rows.
+        """
+        query = "SELECT id, title, file_path, upload_date, file_size, is_active, extraction_status FROM lesson_plans"
+        params = []
+        if cursor:
+            after_date, after_id = self._decode_cursor(cursor)
+            query += " WHERE (upload_date, id) < (?, ?)"
+            params += [after_date, after_id]
+        query += " ORDER BY upload_date DESC, id DESC"
+        if limit is not None:
+            # Fetch one extra row to know whether another page exists
+            query += " LIMIT ?"
+            params.append(limit + 1)
+        
+        with self._get_connection() as conn:
+            rows = conn.execute(query, params).fetchall()
+        
+        next_cursor = None
+        if limit is not None and len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = self._encode_cursor(rows[-1][3], rows[-1][0])
+        
+        return [{
+            'id': row[0],
+            'title': row[1],
+            'file_path': row[2],
+            'upload_date': row[3],
+            'file_size': row[4],
+            'is_active': bool(row[5]),
+            'extraction_status': row[6]
+        } for row in rows], next_cursor
+
+    @staticmethod
+    def _encode_cursor(upload_date: str, plan_id: int) -> str:
+        return base64.urlsafe_b64encode(f"{upload_date}|{plan_id}".encode()).decode()
+
+    @staticmethod
+    def _decode_cursor(cursor: str) -> tuple[str, int]:
+        try:
+            upload_date, plan_id = base64.urlsafe_b64decode(cursor.encode()).decode().rsplit('|', 1)
+            return upload_date, int(plan_id)
+        except Exception:
+            raise ValueError(f"Invalid cursor: {cursor}")
+
+    def search_lesson_plans(self, query: str, limit: int = 20) -> list[dict]:
+        """
+        Full-text search over lesson plan titles and content, best matches first.
+        
+        Every word in the query must appear in the plan. Matches are ranked with
+        bm25 and returned with a short snippet around the matching text.
+        """
+        # Quote each word so punctuation in the query isn't read as FTS5 syntax
+        terms = ['"' + term.replace('"', '""') + '"' for term in query.split()]
+        if not terms:
+            return []
+        
+        with self._get_connection() as conn:
+            rows = conn.execute(
+                """
+                SELECT p.id, p.title, p.upload_date,
+                       snippet(lesson_plans_fts, 1, '**', '**', '...', 16),
+                       bm25(lesson_plans_fts)
+                FROM lesson_plans_fts
+                JOIN lesson_plans p ON p.id = lesson_plans_fts.rowid
+                WHERE lesson_plans_fts MATCH ?
+                ORDER BY bm25(lesson_plans_fts)
+                LIMIT ?
+                """,
+                (" ".join(terms), limit)
+            ).fetchall()
+        
+        return [{
+            'id': row[0],
+            'title': row[1],
+            'upload_date': row[2],
+            'snippet': row[3],
+            'score': row[4]
+        } for row in rows]
+
+    def has_lesson_plan_chunks(self, plan_id: int) -> bool:
+        with self._get_connection() as conn:
+            row = conn.execute(
+                "SELECT 1 FROM lesson_plan_chunks WHERE plan_id = ? LIMIT 1",
+                (plan_id,)
+            ).fetchone()
+            return row is not None
+
+    def save_lesson_plan_chunks(self, plan_id: int, chunks: list[str]) -> None:
+        """Replace the retrieval chunks of a plan"""
+        with self._get_connection() as conn:
+            conn.execute("DELETE FROM lesson_plan_chunks WHERE plan_id = ?", (plan_id,))
+            conn.executemany(
+                "INSERT INTO lesson_plan_chunks (plan_id, chunk_index, text) VALUES (?, ?, ?)",
+                [(plan_id, i, chunk) for i, chunk in enumerate(chunks)]
+            )
+            conn.commit()
+
+    def search_lesson_plan_chunks(self, plan_id: int, query: str, limit: int = 3) -> list[str]:
+        """
+        Chunks of one plan that best match a free-text query, ranked with bm25.
+        
+        Any query word may match, so natural-language questions still find
+        the relevant passages.
+        """
+        terms = ['"' + term.replace('"', '""') + '"' for term in query.split()]
+        if not terms:
+            return []
+        
+        with self._get_connection() as conn:
+            rows = conn.execute(
+                """
+                SELECT c.text
+                FROM lesson_plan_chunks_fts
+                JOIN lesson_plan_chunks c ON c.id = lesson_plan_chunks_fts.rowid
+                WHERE lesson_plan_chunks_fts MATCH ? AND c.plan_id = ?
+                ORDER BY bm25(lesson_plan_chunks_fts)
+                LIMIT ?
+                """,
+                (" OR ".join(terms), plan_id, limit)
+            ).fetchall()
+            return [row[0] for row in rows]
+
+    def get_lesson_plans_version(self) -> int:
+        """Change counter for lesson_plans, incremented on every insert, update and delete"""
+        with self._get_connection() as conn:
+            row = conn.execute(
+                "SELECT version FROM change_counters WHERE name = 'lesson_plans'"
+            ).fetchone()
+            return row[0] if row else 0
+
     def delete_lesson_plan(self, plan_id: int) -> None:
         with self._get_connection() as conn:
             cursor = conn.cursor()
@@ -0,0 +1,43 @@
+"""
+Bulk import cars from a CSV file with vin, make, model and year columns.
+
+Usage:
+    python import_cars.py fleet.csv [--replace]
+"""
+import csv
+import sys
+import time
+import argparse
+from db_driver import DatabaseDriver
+
+
+def read_cars(path: str):
+    with open(path, newline='') as f:
+        reader = csv.DictReader(f)
+        missing = {'vin', 'make', 'model', 'year'} - set(reader.fieldnames or [])
+        if missing:
+            raise ValueError(f"CSV is missing columns: {', '.join(sorted(missing))}")
+        for row in reader:
+            yield row['vin'].strip(), row['make'].strip(), row['model'].strip(), int(row['year'])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("csv_path")
+    parser.add_argument("--replace", action="store_true", help="overwrite cars whose VIN already exists")
+    args = parser.parse_args()
+    
+    db = DatabaseDriver()
+    start = time.perf_counter()
+    try:
+        written = db.import_cars(read_cars(args.csv_path), replace=args.replace)
+    except (ValueError, KeyError) as e:
+        print(f"Import failed, no cars were written: {e}")
+        sys.exit(1)
+    finally:
+        db.close()
+    print(f"Imported {written} cars in {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
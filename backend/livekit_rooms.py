@@ -0,0 +1,95 @@
+import asyncio
+import logging
+import threading
+import time
+import uuid
+from typing import Callable, Optional
+from livekit.api import LiveKitAPI, ListRoomsRequest
+
+logger = logging.getLogger("livekit-rooms")
+
+# How long a room listing is trusted before it is fetched again
+DEFAULT_ROOM_CACHE_TTL = 5.0
+# Names handed out recently are remembered this long, so two requests arriving
+# before the room shows up in a listing can't get the same name
+RECENT_NAME_TTL = 60.0
+
+class BackgroundLoop:
+    """
+    An event loop running forever on a daemon thread.
+
+    Long-lived async clients such as LiveKitAPI hold an aiohttp session that is
+    tied to the loop it was created on, so sync code submits coroutines here
+    instead of starting a new event loop per request.
+    """
+
+    def __init__(self, name: str = "livekit-loop"):
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self.loop.run_forever, name=name, daemon=True)
+        self._thread.start()
+
+    def run(self, coro, timeout: Optional[float] = None):
+        """Run a coroutine on the background loop and wait for its result"""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result(timeout)
+
+    def stop(self) -> None:
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join()
+
+class RoomDirectory:
+    """
+    Shared LiveKit API client with a short-lived cache of room names.
+
+    Room names are generated from enough random bits that collisions are
+    unlikely, and are checked against the cached listing and the names handed
+    out recently, so issuing a token doesn't need a full room listing every time.
+    """
+
+    def __init__(self, api_factory: Callable[[], LiveKitAPI] = LiveKitAPI, ttl: float = DEFAULT_ROOM_CACHE_TTL):
+        self._api_factory = api_factory
+        self._api = None
+        self._ttl = ttl
+        self._rooms: set[str] = set()
+        self._fetched_at: Optional[float] = None
+        self._recent: dict[str, float] = {}
+        self._refresh_lock: Optional[asyncio.Lock] = None
+
+    @property
+    def api(self) -> LiveKitAPI:
+        # Created on first use so it binds to the loop it is used from
+        if self._api is None:
+            self._api = self._api_factory()
+        return self._api
+
+    async def list_room_names(self) -> set[str]:
+        if self._fetched_at is not None and time.monotonic() - self._fetched_at < self._ttl:
+            return self._rooms
+
+        if self._refresh_lock is None:
+            self._refresh_lock = asyncio.Lock()
+        async with self._refresh_lock:
+            # Another caller may have refreshed while we waited for the lock
+            if self._fetched_at is None or time.monotonic() - self._fetched_at >= self._ttl:
+                response = await self.api.room.list_rooms(ListRoomsRequest())
+                self._rooms = {room.name for room in response.rooms}
+                self._fetched_at = time.monotonic()
+        return self._rooms
+
+    async def generate_room_name(self) -> str:
+        rooms = await self.list_room_names()
+        now = time.monotonic()
+        self._recent = {name: at for name, at in self._recent.items() if now - at < RECENT_NAME_TTL}
+
+        name = "room-" + uuid.uuid4().hex[:12]
+        while name in rooms or name in self._recent:
+            name = "room-" + uuid.uuid4().hex[:12]
+        self._recent[name] = now
+        return name
+
+    def invalidate(self) -> None:
+        self._fetched_at = None
+
+    async def aclose(self) -> None:
+        if self._api is not None:
+            await self._api.aclose()
+            self._api = None
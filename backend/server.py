@@ -3,46 +3,54 @@ from livekit import api
 from flask import Flask, request, jsonify, send_file
 from dotenv import load_dotenv
 from flask_cors import CORS
-from livekit.api import LiveKitAPI, ListRoomsRequest
-import uuid
+from livekit_rooms import BackgroundLoop, RoomDirectory
 from werkzeug.utils import secure_filename
 from db_driver import DatabaseDriver
-from utils.pdf_extractor import extract_text_from_pdf
+from utils.extraction_queue import ExtractionQueue, QueueFullError
+from utils.blob_store import BlobStore
 
 load_dotenv()
 
 app = Flask(__name__)
-CORS(app, resources={r"/*": {"origins": "*"}})
+CORS(app, resources={r"/*": {"origins": "*"}}, expose_headers=["ETag", "X-Next-Cursor"])
 
 UPLOAD_FOLDER = os.getenv('UPLOAD_PATH', 'uploads')
 ALLOWED_EXTENSIONS = {'pdf'}
 MAX_CONTENT_LENGTH = 10 * 1024 * 1024  # 10MB limit
+MAX_LIST_LIMIT = 500
+LIVEKIT_TIMEOUT = 10
 
 if not os.path.exists(UPLOAD_FOLDER):
     os.makedirs(UPLOAD_FOLDER)
 
 db = DatabaseDriver()
 
-async def generate_room_name():
-    name = "room-" + str(uuid.uuid4())[:8]
-    rooms = await get_rooms()
-    while name in rooms:
-        name = "room-" + str(uuid.uuid4())[:8]
-    return name
+# Uploaded files are stored by content hash so identical PDFs are kept once
+blob_store = BlobStore(os.path.join(UPLOAD_FOLDER, 'blobs'))
 
-async def get_rooms():
-    api = LiveKitAPI()
-    rooms = await api.room.list_rooms(ListRoomsRequest())
-    await api.aclose()
-    return [room.name for room in rooms.rooms]
+# PDF text extraction runs in background processes so uploads return immediately
+extraction_queue = ExtractionQueue(
+    db,
+    max_workers=int(os.getenv('EXTRACTION_WORKERS', '2')),
+    max_pending=int(os.getenv('EXTRACTION_QUEUE_SIZE', '16')),
+    timeout=float(os.getenv('EXTRACTION_TIMEOUT', '120')),
+    memory_limit_mb=int(os.getenv('EXTRACTION_MEMORY_MB', '512'))
+)
+
+# One LiveKit client and room cache for the whole process, driven from a dedicated event loop
+livekit_loop = BackgroundLoop()
+room_directory = RoomDirectory(ttl=float(os.getenv('ROOM_CACHE_TTL', '5')))
+
+def generate_room_name():
+    return livekit_loop.run(room_directory.generate_room_name(), timeout=LIVEKIT_TIMEOUT)
 
 @app.route("/api/getToken")
-async def get_token():
+def get_token():
     name = request.args.get("name", "my name")
     room = request.args.get("room", None)
     
     if not room:
-        room = await generate_room_name()
+        room = generate_room_name()
         
     token = api.AccessToken(os.getenv("LIVEKIT_API_KEY"), os.getenv("LIVEKIT_API_SECRET")) \
         .with_identity(name)\
@@ -75,30 +83,30 @@ def upload_file():
     
     try:
         filename = secure_filename(file.filename)
-        file_path = os.path.join(UPLOAD_FOLDER, filename)
-        print(f"Attempting to save file to: {file_path}")
+        print(f"Attempting to save file: {filename}")
         
-        # Save file to disk
-        file.save(file_path)
+        # Hash the file while it streams to disk
+        blob = blob_store.save(file.stream)
+        file_path = blob.file_path
         print(f"File saved successfully to {file_path}")
         
-        # Extract text from PDF
-        try:
-            extracted_text = extract_text_from_pdf(file_path)
-            print(f"Extracted {len(extracted_text)} characters from {filename}")
-        except Exception as e:
-            print(f"Warning: Failed to extract text from PDF: {str(e)}")
-            extracted_text = None  # Continue without text if extraction fails
+        def remove_unreferenced_file():
+            if not blob.already_existed and db.count_plans_with_hash(blob.sha256) == 0:
+                blob_store.delete(blob.sha256)
         
-        # Save file info and extracted text to database
-        file_size = os.path.getsize(file_path)
+        # Reuse the text from an earlier upload of the same file instead of extracting again
+        existing_text = db.find_extracted_content(blob.sha256) if blob.already_existed else None
+        
+        # Save file info to database, the extracted text is filled in by the background job
         try:
-            print(f"Saving to database: {filename}, size: {file_size}")
+            print(f"Saving to database: {filename}, size: {blob.file_size}")
             plan_id = db.save_lesson_plan(
                 title=filename,
                 file_path=file_path,
-                file_size=file_size,
-                content=extracted_text
+                file_size=blob.file_size,
+                content=existing_text,
+                extraction_status='done' if existing_text is not None else 'pending',
+                content_hash=blob.sha256
             )
             print(f"Successfully saved to database with ID: {plan_id}")
         except Exception as db_error:
@@ -107,15 +115,35 @@ def upload_file():
             import traceback
             print(f"Traceback: {traceback.format_exc()}")
             # If database save fails, clean up the file
-            if os.path.exists(file_path):
-                os.remove(file_path)
+            remove_unreferenced_file()
             raise db_error
         
+        if existing_text is not None:
+            print(f"Reusing extracted text for duplicate upload: {blob.sha256}")
+            return jsonify({
+                'message': 'File uploaded successfully, text reused from an identical upload',
+                'plan_id': plan_id,
+                'job_id': None,
+                'extraction_status': 'done'
+            }), 200
+        
+        # Queue text extraction, turning the upload away if the queue is full
+        try:
+            job = extraction_queue.submit(plan_id, file_path)
+        except QueueFullError as e:
+            print(f"Extraction queue full, rejecting upload: {filename}")
+            db.delete_lesson_plan(plan_id)
+            remove_unreferenced_file()
+            response = jsonify({'error': str(e)})
+            response.headers['Retry-After'] = '5'
+            return response, 503
+        
         return jsonify({
-            'message': 'File uploaded successfully',
+            'message': 'File uploaded successfully, text extraction queued',
             'plan_id': plan_id,
-            'text_extracted': extracted_text is not None
-        }), 200
+            'job_id': job.id,
+            'extraction_status': job.status
+        }), 202
         
     except Exception as e:
         print(f"Upload error: {str(e)}")
@@ -124,6 +152,13 @@ def upload_file():
         print(f"Traceback: {traceback.format_exc()}")
         return jsonify({'error': str(e)}), 500
 
+@app.route('/jobs/<job_id>', methods=['GET'])
+def extraction_job(job_id):
+    job = extraction_queue.get_job(job_id)
+    if not job:
+        return jsonify({'error': 'Job not found'}), 404
+    return jsonify(job.to_dict()), 200
+
 @app.route('/lesson-plan/<int:plan_id>', methods=['GET', 'DELETE'])
 def lesson_plan(plan_id):
     print(f"Current working directory: {os.getcwd()}")
@@ -135,12 +170,13 @@ def lesson_plan(plan_id):
             if not plan:
                 return jsonify({'error': 'Plan not found'}), 404
                 
-            # Delete file from disk if it exists
-            if os.path.exists(plan['file_path']):
-                os.remove(plan['file_path'])
-                
             # Delete from database
             db.delete_lesson_plan(plan_id)
+            
+            # Delete file from disk if it exists and no other plan shares it
+            if plan['content_hash'] is None or db.count_plans_with_hash(plan['content_hash']) == 0:
+                if os.path.exists(plan['file_path']):
+                    os.remove(plan['file_path'])
             return jsonify({'message': 'Plan deleted successfully'}), 200
         except Exception as e:
             return jsonify({'error': str(e)}), 500
@@ -171,20 +207,66 @@ def lesson_plan(plan_id):
 
 @app.route('/lesson-plans', methods=['GET'])
 def list_lesson_plans():
+    """
+    List lesson plan metadata, newest first.
+    
+    Optional `limit` and `cursor` query args page through the list; the cursor for
+    the next page is returned in the X-Next-Cursor header. The ETag is derived from
+    the lesson_plans change counter so unchanged lists are answered with a 304.
+    """
     try:
-        plans = db.get_all_lesson_plans()
+        limit = request.args.get('limit', type=int)
+        cursor = request.args.get('cursor')
+        if limit is not None and not 1 <= limit <= MAX_LIST_LIMIT:
+            return jsonify({'error': f'limit must be between 1 and {MAX_LIST_LIMIT}'}), 400
+        
+        version = db.get_lesson_plans_version()
+        if request.if_none_match.contains(lesson_plans_etag(version)):
+            response = app.response_class(status=304)
+            response.set_etag(lesson_plans_etag(version))
+            return response
+        
+        try:
+            plans, next_cursor = db.list_lesson_plan_metadata(limit=limit, cursor=cursor)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
         # Filter out plans where files don't exist
         valid_plans = []
         for plan in plans:
-            # Get full file path from database
-            full_plan = db.get_lesson_plan(plan['id'])
-            if full_plan and os.path.exists(full_plan['file_path']):
+            file_path = plan.pop('file_path')
+            if os.path.exists(file_path):
                 valid_plans.append(plan)
             else:
                 # Optionally clean up database entries for missing files
                 db.delete_lesson_plan(plan['id'])
         
-        return jsonify(valid_plans), 200
+        if len(valid_plans) != len(plans):
+            version = db.get_lesson_plans_version()
+        
+        response = jsonify(valid_plans)
+        response.set_etag(lesson_plans_etag(version))
+        response.headers['Cache-Control'] = 'no-cache'
+        if next_cursor:
+            response.headers['X-Next-Cursor'] = next_cursor
+        return response, 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+def lesson_plans_etag(version: int) -> str:
+    return f"lesson-plans-{version}"
+
+@app.route('/lesson-plans/search', methods=['GET'])
+def search_lesson_plans():
+    query = request.args.get('q', '').strip()
+    limit = request.args.get('limit', 20, type=int)
+    if not query:
+        return jsonify({'error': 'Missing search query'}), 400
+    if not 1 <= limit <= MAX_LIST_LIMIT:
+        return jsonify({'error': f'limit must be between 1 and {MAX_LIST_LIMIT}'}), 400
+    
+    try:
+        return jsonify(db.search_lesson_plans(query, limit)), 200
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -0,0 +1,79 @@
+import os
+import sys
+import time
+import asyncio
+import importlib
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+from db_driver import DatabaseDriver
+from async_db_driver import AsyncDatabaseDriver
+
+DB_DELAY = 0.3
+
+
+class SlowDatabaseDriver(DatabaseDriver):
+    """Simulates lock waits or a slow disk on every call"""
+    def get_car_by_vin(self, vin):
+        time.sleep(DB_DELAY)
+        return super().get_car_by_vin(vin)
+
+    def create_car(self, vin, make, model, year):
+        time.sleep(DB_DELAY)
+        return super().create_car(vin, make, model, year)
+
+
+@pytest.fixture
+def api(tmp_path, monkeypatch):
+    monkeypatch.setenv('DB_PATH', str(tmp_path / "test.sqlite"))
+    monkeypatch.chdir(tmp_path)
+    import api
+    api = importlib.reload(api)
+    monkeypatch.setattr(api, 'ASYNC_DB', AsyncDatabaseDriver(SlowDatabaseDriver(str(tmp_path / "slow.sqlite"))))
+    return api
+
+
+async def count_ticks_while(coro, interval=0.01):
+    """Run coro while another task counts how often the event loop gets to it"""
+    ticks = 0
+    
+    async def ticker():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(interval)
+            ticks += 1
+    
+    task = asyncio.create_task(ticker())
+    try:
+        result = await coro
+    finally:
+        task.cancel()
+    return result, ticks
+
+
+def test_tool_calls_do_not_block_event_loop(api):
+    async def run():
+        fnc = api.AssistantFnc()
+        created, create_ticks = await count_ticks_while(fnc.create_car("VIN1", "Ford", "Focus", 2020))
+        found, lookup_ticks = await count_ticks_while(fnc.lookup_car("VIN1"))
+        return created, create_ticks, found, lookup_ticks
+    
+    created, create_ticks, found, lookup_ticks = asyncio.run(run())
+    assert created == "car created!"
+    assert "Ford" in found
+    # A blocked loop would tick at most once during each slow DB call
+    assert create_ticks >= 10
+    assert lookup_ticks >= 10
+
+
+def test_concurrent_writes_then_reads(tmp_path):
+    db = AsyncDatabaseDriver(DatabaseDriver(str(tmp_path / "test.sqlite")))
+    
+    async def run():
+        await asyncio.gather(*(db.create_car(f"VIN{i}", "Ford", "Focus", 2020) for i in range(20)))
+        return await asyncio.gather(*(db.get_car_by_vin(f"VIN{i}") for i in range(20)))
+    
+    cars = asyncio.run(run())
+    assert [car.vin for car in cars] == [f"VIN{i}" for i in range(20)]
+    db.close()
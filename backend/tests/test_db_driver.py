@@ -0,0 +1,148 @@
+import os
+import sys
+import time
+import threading
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from db_driver import DatabaseDriver
+
+
+def test_per_call_mode(tmp_path):
+    db = DatabaseDriver(db_path=str(tmp_path / "test.sqlite"), pool_size=0)
+    db.create_car("VIN1", "Ford", "Focus", 2020)
+    assert db.get_car_by_vin("VIN1").make == "Ford"
+    assert db.get_car_by_vin("missing") is None
+
+
+def test_pooled_mode_uses_wal_and_reuses_connections(tmp_path):
+    db = DatabaseDriver(db_path=str(tmp_path / "test.sqlite"), pool_size=2)
+    with db._get_connection() as conn:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        first = conn
+    with db._get_connection() as conn:
+        assert conn is first
+    db.close()
+
+
+def test_pooled_mode_is_bounded_across_threads(tmp_path):
+    db = DatabaseDriver(db_path=str(tmp_path / "test.sqlite"), pool_size=2)
+    errors = []
+    
+    def worker(n):
+        try:
+            for i in range(50):
+                db.create_car(f"VIN-{n}-{i}", "Ford", "Focus", 2020)
+                assert db.get_car_by_vin(f"VIN-{n}-{i}") is not None
+        except Exception as e:
+            errors.append(e)
+    
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(6)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    
+    assert not errors
+    assert db._pool_created <= 2
+    db.close()
+
+
+def test_failed_statement_returns_connection_to_pool(tmp_path):
+    db = DatabaseDriver(db_path=str(tmp_path / "test.sqlite"), pool_size=1)
+    db.create_car("VIN1", "Ford", "Focus", 2020)
+    try:
+        db.create_car("VIN1", "Ford", "Focus", 2020)
+    except Exception:
+        pass
+    # A second caller must not deadlock waiting on a leaked connection
+    assert db.get_car_by_vin("VIN1") is not None
+    db.close()
+
+
+def test_metadata_listing_pages_without_content(tmp_path):
+    db = DatabaseDriver(db_path=str(tmp_path / "test.sqlite"))
+    ids = [db.save_lesson_plan(f"plan{i}.pdf", f"/tmp/plan{i}.pdf", 100, "x" * 1000) for i in range(5)]
+    
+    first, cursor = db.list_lesson_plan_metadata(limit=2)
+    assert [p['id'] for p in first] == ids[::-1][:2]
+    assert all('content' not in p for p in first)
+    
+    seen = [p['id'] for p in first]
+    while cursor:
+        page, cursor = db.list_lesson_plan_metadata(limit=2, cursor=cursor)
+        seen += [p['id'] for p in page]
+    assert seen == ids[::-1]
+
+
+def test_lesson_plans_version_changes_on_write(tmp_path):
+    db = DatabaseDriver(db_path=str(tmp_path / "test.sqlite"))
+    before = db.get_lesson_plans_version()
+    plan_id = db.save_lesson_plan("plan.pdf", "/tmp/plan.pdf", 100)
+    after_insert = db.get_lesson_plans_version()
+    db.delete_lesson_plan(plan_id)
+    assert before < after_insert < db.get_lesson_plans_version()
+
+
+def test_search_lesson_plans_ranks_and_tracks_changes(tmp_path):
+    db = DatabaseDriver(db_path=str(tmp_path / "test.sqlite"))
+    fractions = db.save_lesson_plan("fractions.pdf", "/tmp/a.pdf", 1, "Fractions: adding fractions with a common denominator")
+    volcanoes = db.save_lesson_plan("volcanoes.pdf", "/tmp/b.pdf", 1, "Volcanoes erupt when magma rises. Fractions of ash fall")
+    pending = db.save_lesson_plan("pending.pdf", "/tmp/c.pdf", 1, extraction_status='pending')
+    
+    results = db.search_lesson_plans("fractions")
+    assert [r['id'] for r in results] == [fractions, volcanoes]
+    assert "**" in results[0]['snippet']
+    
+    # Content filled in later by extraction is indexed, deleted plans drop out
+    db.update_lesson_plan_content(pending, "Photosynthesis in plants", 'done')
+    assert [r['id'] for r in db.search_lesson_plans("photosynthesis")] == [pending]
+    db.delete_lesson_plan(volcanoes)
+    assert [r['id'] for r in db.search_lesson_plans("fractions")] == [fractions]
+    assert db.search_lesson_plans('"unbalanced AND (') == []
+
+
+def test_car_cache_write_through_and_expiry(tmp_path):
+    db = DatabaseDriver(db_path=str(tmp_path / "test.sqlite"), car_cache_ttl=0.05)
+    created = db.create_car("VIN1", "Ford", "Focus", 2020)
+    assert db.get_car_by_vin("VIN1") is created
+    assert not hasattr(created, '__dict__')
+    
+    # A change made behind the driver's back shows up once the entry expires
+    with db._get_connection() as conn:
+        conn.execute("UPDATE cars SET model = 'Fiesta' WHERE vin = 'VIN1'")
+        conn.commit()
+    assert db.get_car_by_vin("VIN1").model == "Focus"
+    time.sleep(0.06)
+    assert db.get_car_by_vin("VIN1").model == "Fiesta"
+
+
+def test_car_cache_is_bounded(tmp_path):
+    db = DatabaseDriver(db_path=str(tmp_path / "test.sqlite"), car_cache_size=2)
+    for i in range(5):
+        db.create_car(f"VIN{i}", "Ford", "Focus", 2020)
+    assert len(db._car_cache._entries) == 2
+    assert db.get_car_by_vin("VIN0").vin == "VIN0"
+
+
+def test_import_cars_skips_or_replaces_existing(tmp_path):
+    db = DatabaseDriver(db_path=str(tmp_path / "test.sqlite"))
+    db.create_car("VIN0", "Ford", "Focus", 2020)
+    rows = ((f"VIN{i}", "Vauxhall", "Corsa", "2019") for i in range(2500))
+    
+    assert db.import_cars(rows) == 2499
+    assert db.get_car_by_vin("VIN0").make == "Ford"
+    assert db.get_car_by_vin("VIN2499").year == 2019
+    
+    assert db.import_cars([("VIN0", "Vauxhall", "Corsa", 2019)], replace=True) == 1
+    assert db.get_car_by_vin("VIN0").make == "Vauxhall"
+
+
+def test_import_cars_is_all_or_nothing(tmp_path):
+    db = DatabaseDriver(db_path=str(tmp_path / "test.sqlite"))
+    # The bad row is in the second batch, after the first has been written
+    rows = [(f"VIN{i}", "Ford", "Focus", 2020) for i in range(1200)] + [("BAD", "Ford", "Focus", "not a year")]
+    try:
+        db.import_cars(rows)
+    except ValueError:
+        pass
+    assert db.get_car_by_vin("VIN1") is None
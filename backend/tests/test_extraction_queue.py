@@ -0,0 +1,34 @@
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+from db_driver import DatabaseDriver
+from utils.extraction_queue import ExtractionQueue, QueueFullError
+
+
+def test_submit_applies_backpressure(tmp_path):
+    db = DatabaseDriver(db_path=str(tmp_path / "test.sqlite"))
+    # No workers, so nothing drains the queue
+    extraction_queue = ExtractionQueue(db, max_workers=0, max_pending=2)
+    
+    extraction_queue.submit(1, "a.pdf")
+    extraction_queue.submit(2, "b.pdf")
+    with pytest.raises(QueueFullError):
+        extraction_queue.submit(3, "c.pdf")
+
+
+def test_failed_extraction_marks_plan_failed(tmp_path):
+    db = DatabaseDriver(db_path=str(tmp_path / "test.sqlite"))
+    bad_pdf = tmp_path / "bad.pdf"
+    bad_pdf.write_bytes(b"not a pdf")
+    plan_id = db.save_lesson_plan("bad.pdf", str(bad_pdf), 9, extraction_status='pending')
+    
+    extraction_queue = ExtractionQueue(db, max_workers=1, timeout=30)
+    job = extraction_queue.submit(plan_id, str(bad_pdf))
+    extraction_queue.shutdown()
+    
+    assert job.status == 'failed'
+    assert job.error
+    assert db.get_lesson_plan(plan_id)['extraction_status'] == 'failed'
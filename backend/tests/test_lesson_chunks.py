@@ -0,0 +1,59 @@
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from db_driver import DatabaseDriver
+from utils.lesson_chunks import chunk_text, build_outline, search_keywords, INLINE_LIMIT
+
+PLAN = """Lesson 4: Volcanoes
+
+Objectives:
+Students can explain how magma reaches the surface.
+
+Starter Activity:
+Show the class a photo of Mount Etna erupting and ask what they think is happening underground.
+
+Main Activity:
+In pairs students label a cross-section of a volcano: magma chamber, vent, crater and ash cloud.
+""" + "\n\n".join(f"Extension {i}:\nWrite a paragraph about eruption number {i} and its effect on nearby towns." for i in range(40))
+
+
+def test_chunks_respect_size_and_keep_all_text():
+    chunks = chunk_text(PLAN, max_chars=200)
+    assert all(len(chunk) <= 200 for chunk in chunks)
+    assert "magma chamber" in " ".join(chunks)
+    assert "eruption number 39" in " ".join(chunks)
+
+
+def test_long_paragraphs_are_split_on_sentences():
+    paragraph = " ".join(f"Sentence number {i} is here." for i in range(100))
+    chunks = chunk_text(paragraph, max_chars=120)
+    assert len(chunks) > 1
+    assert all(len(chunk) <= 120 for chunk in chunks)
+    assert all(chunk.endswith(".") for chunk in chunks)
+
+
+def test_outline_is_short_and_keeps_headings():
+    outline = build_outline(PLAN)
+    assert len(PLAN) > INLINE_LIMIT
+    assert len(outline) < len(PLAN)
+    assert "Lesson 4: Volcanoes" in outline
+    assert "Main Activity:" in outline
+    assert build_outline("Short plan") == "Short plan"
+
+
+def test_retrieval_returns_matching_chunks(tmp_path):
+    db = DatabaseDriver(db_path=str(tmp_path / "test.sqlite"))
+    plan_id = db.save_lesson_plan("volcanoes.pdf", "/tmp/v.pdf", 1, PLAN)
+    other_id = db.save_lesson_plan("other.pdf", "/tmp/o.pdf", 1, "Mount Etna crater photo")
+    db.save_lesson_plan_chunks(plan_id, chunk_text(PLAN, max_chars=200))
+    db.save_lesson_plan_chunks(other_id, chunk_text("Mount Etna crater photo"))
+    
+    results = db.search_lesson_plan_chunks(plan_id, search_keywords("what goes in the magma chamber?"), limit=2)
+    assert 1 <= len(results) <= 2
+    assert "magma chamber" in results[0]
+    assert all("Mount Etna crater photo" != r for r in db.search_lesson_plan_chunks(plan_id, "Etna"))
+    
+    # Chunks are dropped when the plan text changes
+    db.update_lesson_plan_content(plan_id, "New text", 'done')
+    assert not db.has_lesson_plan_chunks(plan_id)
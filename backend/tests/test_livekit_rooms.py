@@ -0,0 +1,46 @@
+import os
+import sys
+import uuid
+import itertools
+import asyncio
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from livekit_rooms import RoomDirectory, BackgroundLoop
+from utils.fake_livekit import FakeLiveKitAPI
+
+
+def test_room_listing_is_cached_and_shared():
+    fake = FakeLiveKitAPI(rooms=["room-a", "room-b"], latency=0.01)
+    directory = RoomDirectory(api_factory=lambda: fake, ttl=60)
+    
+    async def run():
+        names = await asyncio.gather(*(directory.generate_room_name() for _ in range(50)))
+        await directory.aclose()
+        return names
+    
+    names = asyncio.run(run())
+    assert len(set(names)) == 50
+    assert not {"room-a", "room-b"} & set(names)
+    assert fake.room.list_calls == 1
+    assert fake.closed
+
+
+def test_generated_names_skip_existing_rooms(monkeypatch):
+    taken = uuid.UUID(int=1)
+    fresh = uuid.UUID(int=2)
+    ids = itertools.chain([taken, taken], itertools.repeat(fresh))
+    monkeypatch.setattr(uuid, 'uuid4', lambda: next(ids))
+    
+    fake = FakeLiveKitAPI(rooms=["room-" + taken.hex[:12]], latency=0)
+    directory = RoomDirectory(api_factory=lambda: fake)
+    assert asyncio.run(directory.generate_room_name()) == "room-" + fresh.hex[:12]
+
+
+def test_listing_refreshes_after_ttl():
+    fake = FakeLiveKitAPI(latency=0)
+    directory = RoomDirectory(api_factory=lambda: fake, ttl=0)
+    loop = BackgroundLoop()
+    loop.run(directory.generate_room_name())
+    loop.run(directory.generate_room_name())
+    loop.stop()
+    assert fake.room.list_calls == 2
@@ -2,7 +2,8 @@ import os
 import sys
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from utils.pdf_extractor import extract_text_from_pdf
+from utils.pdf_extractor import extract_text_from_pdf, extract_pdf_pages
+from benchmarks.pdf_corpus import make_pdf
 
 def test_pdf_extraction():
  
@@ -22,5 +23,34 @@ def test_pdf_extraction():
     except Exception as e:
         print(f"Error during test: {str(e)}")
 
+def test_parallel_extraction_matches_serial(tmp_path):
+    pdf = make_pdf(str(tmp_path / "plan.pdf"), pages=20)
+    
+    serial = extract_pdf_pages(pdf, workers=1)
+    parallel = extract_pdf_pages(pdf, workers=3)
+    
+    assert parallel.text == serial.text
+    assert parallel.page_offsets == serial.page_offsets
+    assert parallel.pages_extracted == 20
+    assert not parallel.truncated
+    assert extract_text_from_pdf(pdf) == serial.text.strip()
+
+def test_page_offsets_and_limits(tmp_path):
+    pdf = make_pdf(str(tmp_path / "plan.pdf"), pages=20)
+    full = extract_pdf_pages(pdf, workers=1)
+    
+    # Each offset points at the start of that page's text
+    for offset in full.page_offsets[1:]:
+        assert full.text[offset - 1] == "\n"
+    
+    first_pages = extract_pdf_pages(pdf, workers=3, max_pages=5)
+    assert first_pages.pages_extracted == 5
+    assert first_pages.truncated
+    assert full.text.startswith(first_pages.text)
+    
+    limited = extract_pdf_pages(pdf, workers=3, max_chars=1000)
+    assert limited.text == full.text[:1000]
+    assert limited.truncated
+
 if __name__ == "__main__":
     test_pdf_extraction() 
\ No newline at end of file
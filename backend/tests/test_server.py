@@ -0,0 +1,122 @@
+import os
+import sys
+import time
+import importlib
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+
+@pytest.fixture
+def server(tmp_path, monkeypatch):
+    monkeypatch.setenv('DB_PATH', str(tmp_path / "test.sqlite"))
+    monkeypatch.setenv('UPLOAD_PATH', str(tmp_path / "uploads"))
+    monkeypatch.chdir(tmp_path)
+    import server
+    return importlib.reload(server)
+
+
+def add_plan(server, tmp_path, title):
+    file_path = tmp_path / title
+    file_path.write_bytes(b"%PDF-1.4")
+    return server.db.save_lesson_plan(title, str(file_path), 8, "lesson text")
+
+
+def test_lesson_plans_listing_is_metadata_only_and_paginated(server, tmp_path):
+    ids = [add_plan(server, tmp_path, f"plan{i}.pdf") for i in range(3)]
+    client = server.app.test_client()
+    
+    response = client.get('/lesson-plans?limit=2')
+    assert response.status_code == 200
+    assert [p['id'] for p in response.json] == ids[::-1][:2]
+    assert all('content' not in p and 'file_path' not in p for p in response.json)
+    
+    cursor = response.headers['X-Next-Cursor']
+    response = client.get(f'/lesson-plans?limit=2&cursor={cursor}')
+    assert [p['id'] for p in response.json] == ids[:1]
+    assert 'X-Next-Cursor' not in response.headers
+
+
+def test_lesson_plans_listing_revalidates_with_etag(server, tmp_path):
+    add_plan(server, tmp_path, "plan.pdf")
+    client = server.app.test_client()
+    
+    etag = client.get('/lesson-plans').headers['ETag']
+    assert client.get('/lesson-plans', headers={'If-None-Match': etag}).status_code == 304
+    
+    add_plan(server, tmp_path, "other.pdf")
+    response = client.get('/lesson-plans', headers={'If-None-Match': etag})
+    assert response.status_code == 200
+    assert len(response.json) == 2
+
+
+TEST_PDF = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'test_files', 'test.pdf')
+
+
+def upload(client, name='test.pdf'):
+    with open(TEST_PDF, 'rb') as f:
+        return client.post('/upload', data={'file': (f, name)})
+
+
+def wait_for_job(client, job_id):
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        job = client.get(f'/jobs/{job_id}').json
+        if job['status'] in ('done', 'failed'):
+            return job
+        time.sleep(0.1)
+    return job
+
+
+def test_upload_returns_job_and_fills_content_in_background(server, tmp_path):
+    client = server.app.test_client()
+    response = upload(client)
+    assert response.status_code == 202
+    plan_id = response.json['plan_id']
+    
+    job = wait_for_job(client, response.json['job_id'])
+    assert job['status'] == 'done'
+    plan = server.db.get_lesson_plan(plan_id)
+    assert plan['extraction_status'] == 'done'
+    assert plan['content']
+    assert client.get('/jobs/unknown').status_code == 404
+
+
+def test_duplicate_upload_shares_file_and_skips_extraction(server, tmp_path):
+    client = server.app.test_client()
+    first = upload(client, 'first.pdf')
+    wait_for_job(client, first.json['job_id'])
+    
+    second = upload(client, 'second.pdf')
+    assert second.status_code == 200
+    assert second.json['job_id'] is None
+    
+    first_plan = server.db.get_lesson_plan(first.json['plan_id'])
+    second_plan = server.db.get_lesson_plan(second.json['plan_id'])
+    assert second_plan['file_path'] == first_plan['file_path']
+    assert second_plan['content'] == first_plan['content']
+    
+    # The shared file stays until the last plan using it is deleted
+    client.delete(f"/lesson-plan/{first.json['plan_id']}")
+    assert os.path.exists(second_plan['file_path'])
+    client.delete(f"/lesson-plan/{second.json['plan_id']}")
+    assert not os.path.exists(second_plan['file_path'])
+
+
+def test_get_token_uses_shared_room_directory(server, monkeypatch):
+    from livekit_rooms import RoomDirectory
+    from utils.fake_livekit import FakeLiveKitAPI
+    monkeypatch.setenv('LIVEKIT_API_KEY', 'key')
+    monkeypatch.setenv('LIVEKIT_API_SECRET', 'a-test-secret-that-is-long-enough-for-hs256')
+    created = FakeLiveKitAPI.instances
+    fake = FakeLiveKitAPI(rooms=["room-existing"], latency=0.01)
+    monkeypatch.setattr(server, 'room_directory', RoomDirectory(api_factory=lambda: fake, ttl=60))
+    client = server.app.test_client()
+    
+    for _ in range(5):
+        response = client.get('/api/getToken?name=teacher')
+        assert response.status_code == 200
+        assert response.text.count('.') == 2  # a JWT
+    
+    assert fake.room.list_calls == 1
+    assert FakeLiveKitAPI.instances == created + 1
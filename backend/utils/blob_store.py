@@ -0,0 +1,72 @@
+import hashlib
+import logging
+import os
+import tempfile
+from dataclasses import dataclass
+from typing import BinaryIO
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 64 * 1024
+
+@dataclass
+class StoredBlob:
+    sha256: str
+    file_path: str
+    file_size: int
+    already_existed: bool
+
+class BlobStore:
+    """
+    Content-addressed file storage.
+
+    Files are stored once under root/<aa>/<bb>/<sha256><suffix>, where aa and bb
+    are the first two byte pairs of the hash, so identical uploads share a file
+    and different files with the same name can't overwrite each other.
+    """
+
+    def __init__(self, root: str, suffix: str = ".pdf"):
+        self.root = root
+        self.suffix = suffix
+        self._tmp_dir = os.path.join(root, "tmp")
+        os.makedirs(self._tmp_dir, exist_ok=True)
+
+    def path_for(self, sha256: str) -> str:
+        return os.path.join(self.root, sha256[:2], sha256[2:4], sha256 + self.suffix)
+
+    def save(self, stream: BinaryIO) -> StoredBlob:
+        """Hash the stream while writing it to a temp file, then move it into place atomically"""
+        digest = hashlib.sha256()
+        size = 0
+        fd, tmp_path = tempfile.mkstemp(dir=self._tmp_dir, suffix=".part")
+        try:
+            with os.fdopen(fd, "wb") as tmp:
+                while True:
+                    chunk = stream.read(CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    digest.update(chunk)
+                    tmp.write(chunk)
+                    size += len(chunk)
+                tmp.flush()
+                os.fsync(tmp.fileno())
+
+            sha256 = digest.hexdigest()
+            final_path = self.path_for(sha256)
+            if os.path.exists(final_path):
+                os.remove(tmp_path)
+                return StoredBlob(sha256, final_path, size, already_existed=True)
+
+            os.makedirs(os.path.dirname(final_path), exist_ok=True)
+            # The temp file is on the same filesystem, so this rename is atomic
+            os.replace(tmp_path, final_path)
+            return StoredBlob(sha256, final_path, size, already_existed=False)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def delete(self, sha256: str) -> None:
+        path = self.path_for(sha256)
+        if os.path.exists(path):
+            os.remove(path)
@@ -0,0 +1,215 @@
+import logging
+import multiprocessing
+import queue
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Optional
+
+from utils.pdf_extractor import extract_text_from_pdf
+
+logger = logging.getLogger(__name__)
+
+# Number of finished jobs kept in memory so clients can still poll their status
+MAX_FINISHED_JOBS = 1000
+
+
+class QueueFullError(Exception):
+    """Raised when the extraction queue is at capacity"""
+
+
+@dataclass
+class ExtractionJob:
+    plan_id: int
+    file_path: str
+    id: str = field(default_factory=lambda: uuid.uuid4().hex)
+    status: str = 'pending'
+    pages_done: int = 0
+    pages_total: Optional[int] = None
+    characters: Optional[int] = None
+    error: Optional[str] = None
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+
+    def to_dict(self) -> dict:
+        return {
+            'job_id': self.id,
+            'plan_id': self.plan_id,
+            'status': self.status,
+            'pages_done': self.pages_done,
+            'pages_total': self.pages_total,
+            'characters': self.characters,
+            'error': self.error,
+            'created_at': self.created_at,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at,
+        }
+
+
+def _apply_memory_limit(memory_limit_bytes: Optional[int]) -> None:
+    if not memory_limit_bytes:
+        return
+    try:
+        import resource
+        resource.setrlimit(resource.RLIMIT_AS, (memory_limit_bytes, memory_limit_bytes))
+    except (ImportError, ValueError, OSError) as e:
+        # Not every platform supports address space limits (e.g. Windows, macOS)
+        logger.warning(f"Could not apply extraction memory limit: {e}")
+
+
+def _extract_in_child(file_path: str, conn, memory_limit_bytes: Optional[int]) -> None:
+    """Entry point of the extraction process, reports progress and the result over conn"""
+    _apply_memory_limit(memory_limit_bytes)
+    try:
+        text = extract_text_from_pdf(
+            file_path,
+            on_page=lambda done, total: conn.send(('progress', done, total))
+        )
+        conn.send(('done', text))
+    except MemoryError:
+        conn.send(('error', 'Extraction exceeded the memory limit'))
+    except Exception as e:
+        conn.send(('error', str(e)))
+    finally:
+        conn.close()
+
+
+class ExtractionQueue:
+    """
+    Runs PDF text extraction in separate processes.
+
+    At most max_workers extractions run at once, each in its own process with a
+    timeout and an address space limit. Up to max_pending further jobs wait in a
+    bounded queue; beyond that submit() raises QueueFullError so the caller can
+    push back on the client instead of piling up work.
+    """
+
+    def __init__(
+        self,
+        db,
+        max_workers: int = 2,
+        max_pending: int = 16,
+        timeout: float = 120,
+        memory_limit_mb: Optional[int] = 512,
+    ):
+        self._db = db
+        self._max_workers = max_workers
+        self._timeout = timeout
+        self._memory_limit_bytes = memory_limit_mb * 1024 * 1024 if memory_limit_mb else None
+        self._pending = queue.Queue(maxsize=max_pending)
+        self._jobs: OrderedDict[str, ExtractionJob] = OrderedDict()
+        self._jobs_lock = threading.Lock()
+        self._workers: list[threading.Thread] = []
+        self._start_lock = threading.Lock()
+        self._ctx = multiprocessing.get_context('spawn')
+
+    def submit(self, plan_id: int, file_path: str) -> ExtractionJob:
+        self._ensure_workers()
+        job = ExtractionJob(plan_id=plan_id, file_path=file_path)
+        with self._jobs_lock:
+            self._jobs[job.id] = job
+        try:
+            self._pending.put_nowait(job)
+        except queue.Full:
+            with self._jobs_lock:
+                del self._jobs[job.id]
+            raise QueueFullError("Too many PDFs are waiting for extraction, try again shortly")
+        return job
+
+    def get_job(self, job_id: str) -> Optional[ExtractionJob]:
+        with self._jobs_lock:
+            return self._jobs.get(job_id)
+
+    def shutdown(self, wait: bool = True) -> None:
+        for _ in self._workers:
+            self._pending.put(None)
+        if wait:
+            for worker in self._workers:
+                worker.join()
+        self._workers = []
+
+    def _ensure_workers(self) -> None:
+        with self._start_lock:
+            if self._workers:
+                return
+            for i in range(self._max_workers):
+                worker = threading.Thread(target=self._worker_loop, name=f"pdf-extraction-{i}", daemon=True)
+                worker.start()
+                self._workers.append(worker)
+
+    def _worker_loop(self) -> None:
+        while True:
+            job = self._pending.get()
+            if job is None:
+                return
+            try:
+                self._run(job)
+            except Exception as e:
+                logger.error(f"Extraction job {job.id} crashed: {e}")
+                self._finish(job, None, 'failed', str(e))
+
+    def _run(self, job: ExtractionJob) -> None:
+        job.status = 'processing'
+        job.started_at = time.time()
+        self._db.set_extraction_status(job.plan_id, 'processing')
+
+        parent_conn, child_conn = self._ctx.Pipe(duplex=False)
+        process = self._ctx.Process(
+            target=_extract_in_child,
+            args=(job.file_path, child_conn, self._memory_limit_bytes),
+            daemon=True
+        )
+        process.start()
+        child_conn.close()
+
+        deadline = time.monotonic() + self._timeout
+        try:
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._finish(job, None, 'failed', f"Extraction timed out after {self._timeout}s")
+                    return
+
+                if not parent_conn.poll(min(remaining, 0.5)):
+                    continue
+
+                try:
+                    message = parent_conn.recv()
+                except EOFError:
+                    # The child exited without a result, most likely killed by the OS
+                    process.join(1)
+                    self._finish(job, None, 'failed', f"Extraction process exited with code {process.exitcode}")
+                    return
+
+                if message[0] == 'progress':
+                    job.pages_done, job.pages_total = message[1], message[2]
+                elif message[0] == 'done':
+                    self._finish(job, message[1], 'done')
+                    return
+                else:
+                    self._finish(job, None, 'failed', message[1])
+                    return
+        finally:
+            parent_conn.close()
+            if process.is_alive():
+                process.terminate()
+            process.join()
+
+    def _finish(self, job: ExtractionJob, text: Optional[str], status: str, error: Optional[str] = None) -> None:
+        self._db.update_lesson_plan_content(job.plan_id, text, status)
+        job.characters = len(text) if text is not None else None
+        job.error = error
+        job.finished_at = time.time()
+        job.status = status
+        if error:
+            logger.warning(f"Extraction job {job.id} for plan {job.plan_id} failed: {error}")
+        else:
+            logger.info(f"Extracted {job.characters} characters for plan {job.plan_id}")
+
+        with self._jobs_lock:
+            finished = [j for j in self._jobs.values() if j.finished_at is not None]
+            for old in finished[:max(0, len(finished) - MAX_FINISHED_JOBS)]:
+                del self._jobs[old.id]
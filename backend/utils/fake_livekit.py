@@ -0,0 +1,42 @@
+import asyncio
+from dataclasses import dataclass, field
+from typing import Iterable
+
+@dataclass
+class FakeRoom:
+    name: str
+
+@dataclass
+class FakeListRoomsResponse:
+    rooms: list[FakeRoom] = field(default_factory=list)
+
+class FakeRoomService:
+    def __init__(self, rooms: Iterable[str], latency: float):
+        self.rooms = list(rooms)
+        self.latency = latency
+        self.list_calls = 0
+
+    async def list_rooms(self, request) -> FakeListRoomsResponse:
+        self.list_calls += 1
+        # Simulate the network round-trip plus a little per-room serialisation cost
+        await asyncio.sleep(self.latency + len(self.rooms) * 1e-6)
+        return FakeListRoomsResponse([FakeRoom(name) for name in self.rooms])
+
+class FakeLiveKitAPI:
+    """
+    Offline stand-in for livekit.api.LiveKitAPI covering the calls the server makes.
+
+    Every call waits `latency` seconds, and the number of clients created and
+    listings served is counted so tests and benchmarks can check how often the
+    real API would have been hit.
+    """
+
+    instances = 0
+
+    def __init__(self, rooms: Iterable[str] = (), latency: float = 0.05):
+        FakeLiveKitAPI.instances += 1
+        self.room = FakeRoomService(rooms, latency)
+        self.closed = False
+
+    async def aclose(self) -> None:
+        self.closed = True
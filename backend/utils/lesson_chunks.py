@@ -0,0 +1,91 @@
+import re
+
+# Plans shorter than this are small enough to put in the prompt as they are
+INLINE_LIMIT = 2000
+MAX_CHUNK_CHARS = 800
+MAX_OUTLINE_CHARS = 1500
+
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+_WORD = re.compile(r"[A-Za-z0-9']+")
+STOP_WORDS = frozenset("""
+    a about an and are as at be but by can do does for from how i in is it me of on or
+    our should so that the their them there they this to us was we what when where which
+    who why will with you your
+""".split())
+_HEADING = re.compile(r"^(\d+[.)]|[A-Z][A-Za-z0-9 ,&:/'()-]*$|.*:$)")
+
+def chunk_text(text: str, max_chars: int = MAX_CHUNK_CHARS) -> list[str]:
+    """
+    Split lesson plan text into retrieval chunks of at most max_chars characters.
+
+    Paragraphs are kept together where possible: short ones are merged with their
+    neighbours and long ones are split on sentence boundaries.
+    """
+    paragraphs = [" ".join(p.split()) for p in re.split(r"\n\s*\n", text or "")]
+    # PDF extraction often loses blank lines, fall back to single line breaks
+    if len(paragraphs) <= 1:
+        paragraphs = [" ".join(p.split()) for p in (text or "").splitlines()]
+
+    pieces = []
+    for paragraph in paragraphs:
+        if not paragraph:
+            continue
+        if len(paragraph) <= max_chars:
+            pieces.append(paragraph)
+            continue
+        sentence_chunk = ""
+        for sentence in _SENTENCE_END.split(paragraph):
+            while len(sentence) > max_chars:
+                if sentence_chunk:
+                    pieces.append(sentence_chunk)
+                    sentence_chunk = ""
+                pieces.append(sentence[:max_chars])
+                sentence = sentence[max_chars:]
+            if sentence_chunk and len(sentence_chunk) + 1 + len(sentence) > max_chars:
+                pieces.append(sentence_chunk)
+                sentence_chunk = sentence
+            else:
+                sentence_chunk = f"{sentence_chunk} {sentence}" if sentence_chunk else sentence
+        if sentence_chunk:
+            pieces.append(sentence_chunk)
+
+    chunks = []
+    for piece in pieces:
+        if chunks and len(chunks[-1]) + 1 + len(piece) <= max_chars:
+            chunks[-1] = f"{chunks[-1]}\n{piece}"
+        else:
+            chunks.append(piece)
+    return chunks
+
+def build_outline(text: str, max_chars: int = MAX_OUTLINE_CHARS) -> str:
+    """
+    Short outline of a lesson plan for the system prompt.
+
+    Short plans are returned whole. Otherwise the outline is made of heading-like
+    lines (numbered, title case or ending in a colon), falling back to the start
+    of the plan when no headings can be found.
+    """
+    text = (text or "").strip()
+    if len(text) <= INLINE_LIMIT:
+        return text
+
+    outline = []
+    length = 0
+    for line in text.splitlines():
+        line = " ".join(line.split())
+        if not line or len(line) > 80 or not _HEADING.match(line):
+            continue
+        if length + len(line) + 1 > max_chars:
+            break
+        outline.append(line)
+        length += len(line) + 1
+
+    if len(outline) < 3:
+        return text[:max_chars].rsplit(" ", 1)[0] + " ..."
+    return "\n".join(outline)
+
+def search_keywords(query: str) -> str:
+    """Drop common words from a question so ranking is driven by the words that matter"""
+    words = _WORD.findall(query or "")
+    keywords = [word for word in words if word.lower() not in STOP_WORDS]
+    return " ".join(keywords or words)
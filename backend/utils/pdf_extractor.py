@@ -1,15 +1,116 @@
 from PyPDF2 import PdfReader
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Optional
 import logging
+import math
+import os
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-def extract_text_from_pdf(file_path: str) -> str:
+# Below this many pages the cost of starting worker processes outweighs the gain
+PARALLEL_MIN_PAGES = 16
+PAGE_SEPARATOR = "\n"
+
+@dataclass
+class PdfExtraction:
+    text: str
+    page_offsets: list[int] = field(default_factory=list)  # start of each extracted page in text
+    total_pages: int = 0
+    truncated: bool = False
+
+    @property
+    def pages_extracted(self) -> int:
+        return len(self.page_offsets)
+
+def _extract_page_range(file_path: str, start: int, end: int) -> list[str]:
+    """Worker process entry point, each worker opens its own reader"""
+    reader = PdfReader(file_path)
+    return [reader.pages[i].extract_text() or "" for i in range(start, end)]
+
+def extract_pdf_pages(
+    file_path: str,
+    workers: Optional[int] = None,
+    max_pages: Optional[int] = None,
+    max_chars: Optional[int] = None,
+    on_page: Optional[Callable[[int, int], None]] = None
+) -> PdfExtraction:
+    """
+    Extract text page by page, optionally splitting page ranges across worker processes.
+    
+    Args:
+        file_path (str): Path to the PDF file
+        workers (int, optional): Number of worker processes, defaults to the CPU count. 1 extracts in-process
+        max_pages (int, optional): Only extract the first max_pages pages
+        max_chars (int, optional): Stop once the text reaches max_chars characters
+        on_page (callable, optional): Called as on_page(pages_done, pages_total) as pages are collected
+        
+    Returns:
+        PdfExtraction: Text with pages joined by newlines, and the offset at which each page starts
+    """
+    reader = PdfReader(file_path)
+    total_pages = len(reader.pages)
+    page_count = min(total_pages, max_pages) if max_pages is not None else total_pages
+    workers = workers or os.cpu_count() or 1
+    
+    parts: list[str] = []
+    offsets: list[int] = []
+    length = 0
+    truncated = page_count < total_pages
+    
+    def collect(page_text: str) -> bool:
+        """Append a page, returns False once the character limit is reached"""
+        nonlocal length, truncated
+        start = length + len(PAGE_SEPARATOR) if offsets else 0
+        limit_reached = max_chars is not None and start + len(page_text) > max_chars
+        if limit_reached:
+            truncated = True
+            if start >= max_chars:
+                return False
+            page_text = page_text[:max_chars - start]
+        offsets.append(start)
+        parts.append(page_text)
+        length = start + len(page_text)
+        if on_page:
+            on_page(len(offsets), page_count)
+        return not limit_reached
+    
+    if workers <= 1 or page_count < PARALLEL_MIN_PAGES:
+        for i in range(page_count):
+            if not collect(reader.pages[i].extract_text() or ""):
+                break
+    else:
+        # Several ranges per worker so a slow range doesn't leave the others idle
+        pages_per_task = max(1, math.ceil(page_count / (workers * 4)))
+        ranges = [(start, min(start + pages_per_task, page_count)) for start in range(0, page_count, pages_per_task)]
+        with ProcessPoolExecutor(max_workers=min(workers, len(ranges))) as executor:
+            futures = [executor.submit(_extract_page_range, file_path, start, end) for start, end in ranges]
+            done = False
+            for future in futures:
+                for page_text in future.result():
+                    if not collect(page_text):
+                        done = True
+                        break
+                if done:
+                    for pending in futures:
+                        pending.cancel()
+                    break
+    
+    return PdfExtraction(
+        text=PAGE_SEPARATOR.join(parts),
+        page_offsets=offsets,
+        total_pages=total_pages,
+        truncated=truncated
+    )
+
+def extract_text_from_pdf(file_path: str, on_page: Optional[Callable[[int, int], None]] = None) -> str:
     """
     Extract text from a PDF file.
     
     Args:
         file_path (str): Path to the PDF file
+        on_page (callable, optional): Called as on_page(pages_done, pages_total) after each page
         
     Returns:
         str: Extracted text from the PDF
@@ -20,17 +121,12 @@ def extract_text_from_pdf(file_path: str) -> str:
     try:
         logger.info(f"Attempting to extract text from: {file_path}")
         
-        # Create a PDF reader object
-        reader = PdfReader(file_path)
-        
-        # Extract text from all pages
-        text = ""
-        for page in reader.pages:
-            text += page.extract_text() + "\n"
+        # Extract text from all pages in this process, page texts are joined once at the end
+        text = extract_pdf_pages(file_path, workers=1, on_page=on_page).text
             
         logger.info(f"Successfully extracted {len(text)} characters from PDF")
         return text.strip()
         
     except Exception as e:
         logger.error(f"Error extracting text from PDF: {str(e)}")
-        raise Exception(f"Failed to extract text from PDF: {str(e)}") 
\ No newline at end of file
+        raise Exception(f"Failed to extract text from PDF: {str(e)}")